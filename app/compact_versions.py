@@ -0,0 +1,48 @@
+import argparse
+import json
+
+from app.config import settings
+from app.core.jobs import enqueue
+from app.core.retention import RetentionPolicy, compact_versions
+from app.database import SessionLocal
+from app.models import user, event, permission, job  # noqa: F401  Import all models
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune event version history according to the retention policy")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would be removed without deleting anything")
+    parser.add_argument("--keep-all-days", type=int, default=settings.VERSION_RETENTION_KEEP_ALL_DAYS)
+    parser.add_argument("--daily-until-days", type=int, default=settings.VERSION_RETENTION_DAILY_UNTIL_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.VERSION_COMPACTION_BATCH_SIZE,
+                        help="events processed per transaction")
+    parser.add_argument("--enqueue", action="store_true",
+                        help="queue a compaction job for the workers instead of running it here")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.enqueue:
+            job_row = enqueue(db, "compact_versions", {
+                "dry_run": args.dry_run,
+                "keep_all_days": args.keep_all_days,
+                "daily_until_days": args.daily_until_days,
+                "batch_size": args.batch_size
+            })
+            db.commit()
+            print(f"Queued compaction job {job_row.id}")
+            return
+
+        policy = RetentionPolicy(args.keep_all_days, args.daily_until_days)
+        stats = compact_versions(
+            db,
+            policy=policy,
+            dry_run=args.dry_run,
+            batch_size=args.batch_size,
+            progress=lambda done, total: print(f"  {done}/{total} events", flush=True)
+        )
+        print(json.dumps(stats, indent=2))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
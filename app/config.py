@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "NeoFi Event Management"
@@ -13,19 +13,112 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "neofi"
     # SQLALCHEMY_DATABASE_URI: Optional[str] = None
     SQLALCHEMY_DATABASE_URI: Optional[str] = os.getenv("DATABASE_URL")
+    # Local development only; deployments run `alembic upgrade head` instead
+    DB_AUTO_CREATE_TABLES: bool = False
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+
+    # Read replicas (comma separated URLs). GET requests are served by a replica
+    # unless the user wrote something in the last REPLICA_STICKINESS_SECONDS.
+    SQLALCHEMY_REPLICA_URIS: Optional[str] = os.getenv("DATABASE_REPLICA_URLS")
+    REPLICA_SELECTION: str = "round_robin"  # or "least_busy"
+    REPLICA_STICKINESS_SECONDS: float = 5.0
 
 
     JWT_SECRET_KEY: str = "secret"  # Change in production
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Rate limiting: a token bucket per user (per client IP for the auth routes).
+    # Each route spends RATE_LIMIT_COSTS[route] tokens (default 1).
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_CAPACITY: float = 60.0
+    RATE_LIMIT_REFILL_PER_SECOND: float = 5.0
+    RATE_LIMIT_COSTS: Dict[str, float] = {
+        "login": 20.0,  # bcrypt
+        "register": 20.0,  # bcrypt
+        "refresh": 2.0,
+        "create_event": 3.0,
+        "update_event": 3.0,
+        "delete_event": 3.0,
+        "share_event": 3.0,
+        "export_events": 10.0,
+        "get_job_output": 2.0,
+        "search": 2.0,
+        "get_event_history": 2.0,
+        "get_version_diff": 2.0,
+    }
+    # "memory" (per process), "redis" (shared, needs the redis package) or "module:Class"
+    RATE_LIMIT_STORE: str = "memory"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    # Comma-separated addresses or CIDRs of the reverse proxies in front of the
+    # API (e.g. the platform's edge proxy). Per-IP limits key on the rightmost
+    # X-Forwarded-For entry not added by one of these. When empty, per-IP limits
+    # are off (login is still limited per username); a server that clients
+    # reach directly can set it to "127.0.0.1" to key on the connecting address.
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""
+
+    # Requests allowed in flight per process before new ones are shed with a 503.
+    # Defaults to what the DB pool can serve alongside the in-process job workers.
+    MAX_CONCURRENT_REQUESTS: Optional[int] = None
+    CONCURRENCY_QUEUE_TIMEOUT_SECONDS: float = 0.5
+
+    # Responses at least GZIP_MINIMUM_SIZE bytes are gzipped for clients that accept it
+    GZIP_ENABLED: bool = True
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+
+    # Per-user cache of serialized GET /api/events responses, LRU-evicted to stay
+    # under EVENT_LIST_CACHE_MAX_BYTES. EVENT_LIST_CACHE_CHANNEL tells the other
+    # API processes about invalidations: "memory" (none; they catch up within the
+    # TTL), "postgres" (LISTEN/NOTIFY) or "module:Class".
+    EVENT_LIST_CACHE_ENABLED: bool = True
+    EVENT_LIST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    EVENT_LIST_CACHE_TTL_SECONDS: float = 300.0
+    EVENT_LIST_CACHE_CHANNEL: str = "memory"
+
+    # Background jobs
+    JOB_INPROCESS_WORKERS: int = 1  # Worker threads started inside each API process
+    JOB_WORKER_THREADS: int = 4  # Default for the standalone `python -m app.worker`
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 300  # A running job whose lease expires is picked up again
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BACKOFF_SECONDS: float = 2.0
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 600.0
+
+    # Event version retention: keep every version for KEEP_ALL_DAYS, then the
+    # last version of each day until DAILY_UNTIL_DAYS, then the last of each month.
+    # The first and latest version of an event are always kept.
+    VERSION_RETENTION_KEEP_ALL_DAYS: int = 30
+    VERSION_RETENTION_DAILY_UNTIL_DAYS: int = 365
+    VERSION_COMPACTION_BATCH_SIZE: int = 500  # Events per compaction transaction
+
+    # Rows removed per transaction when purging soft-deleted events
+    PURGE_BATCH_SIZE: int = 1000
+    # A periodic sweep re-enqueues purges for events soft deleted more than
+    # PURGE_SWEEP_GRACE_SECONDS ago, in case their purge job failed or never ran
+    PURGE_SWEEP_INTERVAL_SECONDS: float = 3600.0
+    PURGE_SWEEP_GRACE_SECONDS: float = 3600.0
+    PURGE_SWEEP_LIMIT: int = 1000
+
     class Config:
         case_sensitive = True
         env_file = ".env"
 
+    @property
+    def replica_uris(self) -> List[str]:
+        if not self.SQLALCHEMY_REPLICA_URIS:
+            return []
+        return [uri.strip() for uri in self.SQLALCHEMY_REPLICA_URIS.split(",") if uri.strip()]
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not self.SQLALCHEMY_DATABASE_URI:
             self.SQLALCHEMY_DATABASE_URI = f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
+        if self.MAX_CONCURRENT_REQUESTS is None:
+            self.MAX_CONCURRENT_REQUESTS = max(
+                self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW - self.JOB_INPROCESS_WORKERS, 1
+            )
 
 settings = Settings() 
\ No newline at end of file
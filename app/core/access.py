@@ -0,0 +1,42 @@
+from typing import Set
+
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.permission import EventPermission, Role
+
+# Who can see what: shared by the HTTP routers and the background jobs
+
+def check_permission(db: Session, event_id: int, user_id: int, required_role: Role) -> bool:
+    # Soft-deleted events behave as if they no longer exist
+    permission = db.query(EventPermission).join(Event).filter(
+        EventPermission.event_id == event_id,
+        EventPermission.user_id == user_id,
+        Event.deleted_at.is_(None)
+    ).first()
+    
+    if not permission:
+        return False
+    
+    role_hierarchy = {Role.OWNER: 3, Role.EDITOR: 2, Role.VIEWER: 1}
+    return role_hierarchy[permission.role] >= role_hierarchy[required_role]
+
+def accessible_events(db: Session, user_id: int):
+    return db.query(Event).filter(
+        Event.deleted_at.is_(None),
+        (Event.owner_id == user_id) |  # User is owner
+        (Event.id.in_(
+            db.query(EventPermission.event_id).filter(
+                EventPermission.user_id == user_id
+            )
+        ))  # User has permissions
+    )
+
+def event_audience(db: Session, event: Event) -> Set[int]:
+    # Users whose event list includes `event`
+    user_ids = {
+        row.user_id for row in
+        db.query(EventPermission.user_id).filter(EventPermission.event_id == event.id).all()
+    }
+    user_ids.add(event.owner_id)
+    return user_ids
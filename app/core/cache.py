@@ -0,0 +1,284 @@
+import importlib
+import logging
+import select
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Called with the users whose cached lists are stale, or None for everyone
+InvalidationCallback = Callable[[Optional[Set[int]]], None]
+
+class InvalidationChannel(ABC):
+    # Tells the *other* API processes which users' cached lists to drop; the
+    # publishing process has already dropped its own entries.
+    @abstractmethod
+    def publish(self, user_ids: Set[int]) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+class InProcessChannel(InvalidationChannel):
+    # Single API process: nobody else to tell. With several processes each one
+    # serves its own cached lists until they expire (EVENT_LIST_CACHE_TTL_SECONDS).
+    def publish(self, user_ids: Set[int]) -> None:
+        pass
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        pass
+
+class PostgresNotifyChannel(InvalidationChannel):
+    # Invalidations are sent with pg_notify and received by a LISTEN thread in
+    # every process. Payloads are "<origin>:<id>,<id>,..." so a process can skip
+    # its own. After a dropped connection notifications may have been missed,
+    # so the whole cache is cleared on every (re)connect.
+    CHANNEL = "event_list_cache"
+    MAX_PAYLOAD = 7000  # Postgres rejects payloads of 8000 bytes or more
+
+    def __init__(self):
+        try:
+            import psycopg2
+        except ImportError:
+            raise RuntimeError("EVENT_LIST_CACHE_CHANNEL=postgres requires the 'psycopg2' package")
+        self._psycopg2 = psycopg2
+        self._origin = uuid.uuid4().hex
+        self._callbacks: List[InvalidationCallback] = []
+        self._publisher = None
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def _connect(self):
+        # Dedicated connections outside the pool: the listener holds one forever
+        from app.database import get_engine
+        engine = get_engine()
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        connection = self._psycopg2.connect(*cargs, **cparams)
+        connection.autocommit = True
+        return connection
+
+    def _payloads(self, user_ids: Iterable[int]) -> List[str]:
+        payloads, chunk, length = [], [], len(self._origin) + 1
+        for user_id in map(str, sorted(user_ids)):
+            if chunk and length + len(user_id) + 1 > self.MAX_PAYLOAD:
+                payloads.append(f"{self._origin}:{','.join(chunk)}")
+                chunk, length = [], len(self._origin) + 1
+            chunk.append(user_id)
+            length += len(user_id) + 1
+        if chunk:
+            payloads.append(f"{self._origin}:{','.join(chunk)}")
+        return payloads
+
+    def publish(self, user_ids: Set[int]) -> None:
+        with self._publish_lock:
+            try:
+                if self._publisher is None or self._publisher.closed:
+                    self._publisher = self._connect()
+                with self._publisher.cursor() as cursor:
+                    for payload in self._payloads(user_ids):
+                        cursor.execute("SELECT pg_notify(%s, %s)", (self.CHANNEL, payload))
+            except self._psycopg2.Error:
+                # Other processes fall back to the TTL for these users
+                logger.exception("Failed to publish cache invalidation")
+                self._publisher = None
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        self._callbacks.append(callback)
+        if self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name="event-list-cache-listener", daemon=True)
+            self._listener.start()
+
+    def _deliver(self, user_ids: Optional[Set[int]]) -> None:
+        for callback in self._callbacks:
+            callback(user_ids)
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.CHANNEL}")
+                self._deliver(None)
+                while not self._stop.is_set():
+                    if select.select([connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        origin, _, ids = connection.notifies.pop(0).payload.partition(":")
+                        if origin != self._origin:
+                            self._deliver({int(user_id) for user_id in ids.split(",") if user_id})
+            except Exception:
+                logger.exception("Cache invalidation listener failed; reconnecting")
+                self._stop.wait(1.0)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+
+class EventListCache:
+    # Serialized list_events bodies keyed by (user_id, *params), evicted least
+    # recently used first once their total size passes `max_bytes`.
+    #
+    # A request takes a `version()` before querying and hands it back to `put`,
+    # which refuses to store the body if the user was invalidated in between,
+    # so a write racing a read can't leave a stale list cached.
+    #
+    # Bodies read from a replica are not stored for users invalidated within
+    # the last TTL: however long the replica lags, a list that predates the
+    # change could otherwise outlive it by a whole TTL.
+    ENTRY_OVERHEAD = 200  # Rough bytes of bookkeeping per entry
+    VERSION_HORIZON_SECONDS = 60.0  # Longest read whose body `put` still accepts
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, channel: InvalidationChannel):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.channel = channel
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[bytes, float]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[Tuple[Hashable, ...]]] = {}
+        self._size = 0
+        self._sequence = 0
+        self._cleared_at = 0
+        self._cleared_time = 0.0
+        self._invalidated: Dict[int, Tuple[int, float]] = {}  # user_id -> (sequence, monotonic time)
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        channel.subscribe(self._drop)
+
+    def version(self) -> Tuple[int, float]:
+        with self._lock:
+            return self._sequence, time.monotonic()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_seconds:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                metrics.inc("event_list_cache_misses_total")
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                metrics.inc("event_list_cache_hits_total")
+            metrics.set("event_list_cache_hit_ratio", self._hits / (self._hits + self._misses))
+            return entry[0] if entry is not None else None
+
+    def put(self, key: Tuple[Hashable, ...], body: bytes, version: Tuple[int, float], from_replica: bool = False) -> bool:
+        user_id = key[0]
+        size = len(body) + self.ENTRY_OVERHEAD
+        with self._lock:
+            now = time.monotonic()
+            sequence, started = version
+            invalidated_sequence, invalidated_time = self._invalidated.get(user_id, (0, 0.0))
+            if (
+                sequence < self._cleared_at
+                or sequence < invalidated_sequence
+                or now - started > self.VERSION_HORIZON_SECONDS
+                or (from_replica and now - max(invalidated_time, self._cleared_time) < self.ttl_seconds)
+            ):
+                metrics.inc("event_list_cache_stale_skipped_total")
+                return False
+            if size > self.max_bytes // 8:
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, now)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                metrics.inc("event_list_cache_evictions_total")
+            self._update_gauges()
+            return True
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        self._drop(user_ids)
+        self.channel.publish(user_ids)
+
+    def _drop(self, user_ids: Optional[Set[int]]) -> None:
+        with self._lock:
+            self._sequence += 1
+            now = time.monotonic()
+            if user_ids is None:
+                self._cleared_at = self._sequence
+                self._cleared_time = now
+                self._entries.clear()
+                self._keys_by_user.clear()
+                self._size = 0
+            else:
+                for user_id in user_ids:
+                    self._invalidated[user_id] = (self._sequence, now)
+                    for key in list(self._keys_by_user.get(user_id, ())):
+                        self._remove(key)
+                if len(self._invalidated) > 10000:
+                    horizon = now - max(self.VERSION_HORIZON_SECONDS, self.ttl_seconds)
+                    self._invalidated = {k: v for k, v in self._invalidated.items() if v[1] > horizon}
+            metrics.inc("event_list_cache_invalidations_total", len(user_ids) if user_ids else 1)
+            self._update_gauges()
+
+    def _remove(self, key: Tuple[Hashable, ...]) -> None:
+        body, _ = self._entries.pop(key)
+        self._size -= len(body) + self.ENTRY_OVERHEAD
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def _update_gauges(self) -> None:
+        metrics.set("event_list_cache_entries", len(self._entries))
+        metrics.set("event_list_cache_bytes", self._size)
+
+_cache: Optional[EventListCache] = None
+_cache_lock = threading.Lock()
+
+def get_event_list_cache() -> Optional[EventListCache]:
+    global _cache
+    if not settings.EVENT_LIST_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                name = settings.EVENT_LIST_CACHE_CHANNEL
+                if name == "memory":
+                    channel = InProcessChannel()
+                elif name == "postgres":
+                    channel = PostgresNotifyChannel()
+                else:
+                    module_name, _, class_name = name.partition(":")
+                    channel = getattr(importlib.import_module(module_name), class_name)()
+                _cache = EventListCache(
+                    settings.EVENT_LIST_CACHE_MAX_BYTES,
+                    settings.EVENT_LIST_CACHE_TTL_SECONDS,
+                    channel
+                )
+    return _cache
+
+def invalidate_event_lists(user_ids: Iterable[int]) -> None:
+    # Call after committing a change to events these users can see
+    cache = get_event_list_cache()
+    if cache is not None:
+        cache.invalidate(user_ids)
@@ -0,0 +1,64 @@
+import gzip
+import time
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.metrics import metrics
+
+class GZipMiddleware:
+    # Like Starlette's GZipMiddleware, but only buffers complete (single
+    # message) bodies and records how many bytes compression saved and how long
+    # it took, so the threshold and level can be tuned from /metrics.
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether it is worth compressing
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                # Streaming, small or already encoded: sent as is
+                await send(start_message)
+                start_message = None
+                await send(message)
+                return
+
+            started = time.perf_counter()
+            compressed = gzip.compress(body, compresslevel=self.compresslevel)
+            elapsed = time.perf_counter() - started
+
+            headers["Content-Encoding"] = "gzip"
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            headers.append("Server-Timing", f"gzip;dur={elapsed * 1000:.2f}")
+            await send(start_message)
+            start_message = None
+            await send({"type": "http.response.body", "body": compressed})
+
+            metrics.inc("gzip_responses_total")
+            metrics.inc("gzip_bytes_in_total", len(body))
+            metrics.inc("gzip_bytes_out_total", len(compressed))
+            metrics.inc("gzip_bytes_saved_total", len(body) - len(compressed))
+            metrics.inc("gzip_seconds_total", elapsed)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,302 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job import Job, JobOutput, JobStatus, utcnow
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between polls while the database keeps failing
+POLL_BACKOFF_MAX_SECONDS = 60.0
+
+JobHandler = Callable[["JobContext"], Optional[Dict[str, Any]]]
+
+# Registry of job type -> handler, filled in by @job_handler (see app/core/tasks.py)
+_handlers: Dict[str, JobHandler] = {}
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+# Job type -> seconds between runs, for handlers registered with @periodic_job
+_periodic: Dict[str, float] = {}
+
+def periodic_job(job_type: str, interval_seconds: float) -> Callable[[JobHandler], JobHandler]:
+    # A handler that reschedules itself `interval_seconds` after each run ends.
+    # Workers also enqueue one on startup if none is pending, so at most one
+    # normally exists at a time.
+    def decorator(func: JobHandler) -> JobHandler:
+        _periodic[job_type] = interval_seconds
+        return job_handler(job_type)(func)
+    return decorator
+
+def schedule_periodic_jobs(db: Session, job_types: Optional[List[str]] = None, delay: bool = False) -> None:
+    now = utcnow()
+    for job_type in job_types or list(_periodic):
+        queued = db.query(Job.id).filter(
+            Job.job_type == job_type,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+        ).first()
+        if queued is None:
+            run_after = now + timedelta(seconds=_periodic[job_type]) if delay else now
+            enqueue(db, job_type, run_after=run_after)
+    db.commit()
+
+def enqueue(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    created_by: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    run_after: Optional[datetime] = None
+) -> Job:
+    # The job becomes visible to workers when the caller commits, so it can
+    # share a transaction with the change that requires it.
+    job = Job(
+        job_type=job_type,
+        status=JobStatus.PENDING,
+        payload=payload or {},
+        created_by=created_by,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=run_after or utcnow()
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+def retry_delay(attempts: int) -> float:
+    # Exponential backoff with a little jitter so failed jobs don't retry in lockstep
+    delay = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    delay = min(delay, settings.JOB_RETRY_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(1.0, 1.25)
+
+def _abandoned(now: datetime):
+    # RUNNING, but the worker's lease ran out (crashed, OOM-killed, SIGKILLed)
+    return and_(Job.status == JobStatus.RUNNING, Job.locked_until < now)
+
+def _runnable(now: datetime):
+    return or_(
+        and_(Job.status == JobStatus.PENDING, Job.run_after <= now),
+        and_(_abandoned(now), Job.attempts < Job.max_attempts)
+    )
+
+def fail_exhausted_jobs(db: Session, now: datetime) -> int:
+    # A job that kills its worker never reaches run_job's failure handling, so
+    # once it has used up its attempts it is failed here instead of re-run
+    failed = db.execute(
+        update(Job)
+        .where(_abandoned(now), Job.attempts >= Job.max_attempts)
+        .values(
+            status=JobStatus.FAILED,
+            error="Worker stopped responding during the final attempt",
+            locked_until=None,
+            finished_at=now
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if failed and _periodic:
+        schedule_periodic_jobs(db, delay=True)
+    return failed
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[Job]:
+    now = utcnow()
+    fail_exhausted_jobs(db, now)
+    candidates = db.query(Job.id).filter(_runnable(now)).order_by(
+        Job.run_after, Job.id
+    ).limit(10).all()
+
+    for (job_id,) in candidates:
+        # Conditional update: only one worker can move a given row out of the runnable state
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, _runnable(now))
+            .values(
+                status=JobStatus.RUNNING,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                attempts=Job.attempts + 1,
+                started_at=now
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(Job, job_id)
+    return None
+
+class JobContext:
+    def __init__(self, db: Session, job: Job, worker_id: str):
+        self.db = db
+        self.job_id = job.id
+        self.job_type = job.job_type
+        self.payload: Dict[str, Any] = dict(job.payload or {})
+        self.attempt = job.attempts
+        self.worker_id = worker_id
+        self._last_report = 0.0
+
+    def clear_output(self) -> None:
+        # Drops parts written by an earlier, failed attempt
+        self.db.execute(
+            delete(JobOutput).where(JobOutput.job_id == self.job_id).execution_options(synchronize_session=False)
+        )
+
+    def write_output(self, part: int, data: Any) -> None:
+        self.db.add(JobOutput(job_id=self.job_id, part=part, data=data))
+
+    def report_progress(self, current: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        # Throttled, and written through its own session so that progress is
+        # visible without committing the handler's in-flight work.
+        now = time.monotonic()
+        finished = total is not None and current >= total
+        if not finished and now - self._last_report < 1.0:
+            return
+        self._last_report = now
+
+        values: Dict[str, Any] = {
+            "progress_current": current,
+            "locked_until": utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        }
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["progress_message"] = message
+
+        with SessionLocal() as progress_db:
+            progress_db.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.locked_by == self.worker_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            progress_db.commit()
+
+def _finish(db: Session, job_id: int, worker_id: str, **values: Any) -> None:
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.locked_by == worker_id)
+        .values(locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+def run_job(db: Session, job: Job, worker_id: str) -> None:
+    job_type = job.job_type
+    _run_handler(db, job, worker_id)
+    if job_type in _periodic:
+        # No-op while a retry of this run is still pending
+        schedule_periodic_jobs(db, [job_type], delay=True)
+
+def _run_handler(db: Session, job: Job, worker_id: str) -> None:
+    handler = _handlers.get(job.job_type)
+    if handler is None:
+        _finish(
+            db, job.id, worker_id,
+            status=JobStatus.FAILED,
+            error=f"Unknown job type: {job.job_type}",
+            finished_at=utcnow()
+        )
+        return
+
+    context = JobContext(db, job, worker_id)
+    attempts, max_attempts = job.attempts, job.max_attempts
+    try:
+        result = handler(context)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.exception("Job %s (%s) failed on attempt %s", job.id, job.job_type, attempts)
+        error = f"{type(e).__name__}: {e}"
+        if attempts < max_attempts:
+            _finish(
+                db, context.job_id, worker_id,
+                status=JobStatus.PENDING,
+                error=error,
+                run_after=utcnow() + timedelta(seconds=retry_delay(attempts))
+            )
+        else:
+            _finish(
+                db, context.job_id, worker_id,
+                status=JobStatus.FAILED,
+                error=error,
+                finished_at=utcnow()
+            )
+        return
+
+    _finish(
+        db, context.job_id, worker_id,
+        status=JobStatus.SUCCEEDED,
+        result=result,
+        error=None,
+        finished_at=utcnow()
+    )
+
+class WorkerPool:
+    def __init__(self, size: int, poll_interval: Optional[float] = None, name: str = "jobs"):
+        self.size = size
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+        self.name = name
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._threads:
+                self._start_threads()
+
+    def _start_threads(self) -> None:
+        self._stop.clear()
+        prefix = f"{socket.gethostname()}:{os.getpid()}:{self.name}"
+        for i in range(self.size):
+            thread = threading.Thread(
+                target=self._run,
+                args=(f"{prefix}-{i}",),
+                name=f"{self.name}-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_id: str) -> None:
+        failures = 0
+        scheduled = False
+        while not self._stop.is_set():
+            try:
+                with SessionLocal() as db:
+                    if not scheduled:
+                        schedule_periodic_jobs(db)
+                        scheduled = True
+                    job = claim_next_job(db, worker_id)
+                    if job is not None:
+                        run_job(db, job, worker_id)
+                        failures = 0
+                        continue
+                failures = 0
+            except Exception:
+                # Typically the database is down or not migrated yet: back off
+                # exponentially and log the first failure and then every 10th
+                failures += 1
+                if failures == 1 or failures % 10 == 0:
+                    logger.exception("Job worker %s failed to poll (%s consecutive failures)", worker_id, failures)
+                self._stop.wait(min(self.poll_interval * 2 ** min(failures, 10), POLL_BACKOFF_MAX_SECONDS))
+                continue
+            self._stop.wait(self.poll_interval)
\ No newline at end of file
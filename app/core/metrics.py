@@ -0,0 +1,23 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+class Metrics:
+    # Process-local counters and gauges, exposed as JSON at GET /metrics
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        with self._lock:
+            self._counters[name] = value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+metrics = Metrics()
\ No newline at end of file
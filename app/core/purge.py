@@ -0,0 +1,77 @@
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.jobs import enqueue
+from app.core.search import remove_event
+from app.models.event import Event, EventVersion
+from app.models.job import utcnow
+from app.models.permission import EventPermission
+
+def _delete_in_batches(db: Session, model: Any, event_id: int, batch_size: int, on_batch: Callable[[int], None]) -> int:
+    # Bounded DELETE ... WHERE id IN (...) batches, committed one by one, so a
+    # large history never holds long locks or gets loaded into the session
+    removed = 0
+    while True:
+        ids = [row.id for row in db.query(model.id).filter(model.event_id == event_id).limit(batch_size).all()]
+        if not ids:
+            return removed
+        db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        removed += len(ids)
+        on_batch(len(ids))
+
+def purge_event(
+    db: Session,
+    event_id: int,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None
+) -> Dict[str, Any]:
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    stats = {"event_id": event_id, "versions_deleted": 0, "permissions_deleted": 0, "event_deleted": False}
+
+    event = db.query(Event.id, Event.deleted_at).filter(Event.id == event_id).first()
+    if event is None or event.deleted_at is None:
+        # Already purged (e.g. by an earlier job for the same tombstone)
+        return stats
+
+    removed = 0
+    def on_batch(count: int) -> None:
+        nonlocal removed
+        removed += count
+        if progress:
+            progress(removed)
+
+    stats["versions_deleted"] = _delete_in_batches(db, EventVersion, event_id, batch_size, on_batch)
+    stats["permissions_deleted"] = _delete_in_batches(db, EventPermission, event_id, batch_size, on_batch)
+
+    remove_event(db, event_id)
+    db.execute(
+        delete(Event)
+        .where(Event.id == event_id, Event.deleted_at.isnot(None))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    stats["event_deleted"] = True
+    return stats
+
+def enqueue_stale_purges(db: Session, grace_seconds: Optional[float] = None, limit: Optional[int] = None) -> int:
+    # Tombstones older than the grace period should have been purged by now:
+    # their job failed for good or never ran. purge_event is idempotent, so
+    # enqueueing a second purge for one that is merely slow is harmless.
+    grace_seconds = grace_seconds if grace_seconds is not None else settings.PURGE_SWEEP_GRACE_SECONDS
+    cutoff = utcnow() - timedelta(seconds=grace_seconds)
+    event_ids = [
+        row.id for row in
+        db.query(Event.id).filter(Event.deleted_at < cutoff)
+        .order_by(Event.deleted_at).limit(limit or settings.PURGE_SWEEP_LIMIT).all()
+    ]
+    for event_id in event_ids:
+        enqueue(db, "purge_event", {"event_id": event_id})
+    db.commit()
+    return len(event_ids)
@@ -0,0 +1,199 @@
+import asyncio
+import importlib
+import ipaddress
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+class RateLimitStore(ABC):
+    # Token buckets keyed by client. `consume` takes `cost` tokens and returns 0
+    # if that was possible, otherwise the seconds until enough tokens refill.
+    @abstractmethod
+    def consume(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        ...
+
+class InMemoryRateLimitStore(RateLimitStore):
+    # Per process: with N API workers a client effectively gets N buckets
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)  # least recently seen client
+            return wait
+
+class RedisRateLimitStore(RateLimitStore):
+    # Shared across processes and hosts. The bucket update runs as one Lua
+    # script on the Redis clock, so concurrent API workers can't race.
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        wait = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORE=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url or settings.RATE_LIMIT_REDIS_URL or "redis://localhost:6379/0")
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def consume(self, key: str, cost: float, capacity: float, refill_per_second: float) -> float:
+        return float(self._script(keys=[f"ratelimit:{key}"], args=[capacity, refill_per_second, cost]))
+
+_store: Optional[RateLimitStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> RateLimitStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                name = settings.RATE_LIMIT_STORE
+                if name == "memory":
+                    _store = InMemoryRateLimitStore()
+                elif name == "redis":
+                    _store = RedisRateLimitStore()
+                else:
+                    module_name, _, class_name = name.partition(":")
+                    _store = getattr(importlib.import_module(module_name), class_name)()
+    return _store
+
+def enforce(key: str, route: str) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    capacity = settings.RATE_LIMIT_CAPACITY
+    cost = min(settings.RATE_LIMIT_COSTS.get(route, 1.0), capacity)
+    try:
+        retry_after = get_store().consume(key, cost, capacity, settings.RATE_LIMIT_REFILL_PER_SECOND)
+    except Exception:
+        # An unavailable shared store must not take the API down with it
+        logger.exception("Rate limit store failed; allowing request")
+        return
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+@lru_cache(maxsize=4)
+def _trusted_proxies(setting: str) -> List[IPNetwork]:
+    networks = []
+    for entry in setting.split(","):
+        if entry.strip():
+            networks.append(ipaddress.ip_network(entry.strip(), strict=False))
+    return networks
+
+def _is_trusted(host: str, proxies: List[IPNetwork]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in proxies)
+
+def client_ip(request: Request) -> Optional[str]:
+    # Walks X-Forwarded-For from the right, past the hops appended by trusted
+    # proxies. Entries further left are written by the client itself and are
+    # never used, so a forged header can't buy a fresh bucket.
+    #
+    # Returns None when no proxies are configured: behind an unknown proxy the
+    # connecting address is the proxy itself, and keying on it would make every
+    # client share one bucket.
+    proxies = _trusted_proxies(settings.RATE_LIMIT_TRUSTED_PROXIES)
+    if not proxies:
+        return None
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted(host, proxies):
+        return host
+    forwarded = request.headers.get("X-Forwarded-For", "")
+    for hop in reversed([item.strip() for item in forwarded.split(",") if item.strip()]):
+        if not _is_trusted(hop, proxies):
+            return hop
+    return host
+
+def limit_by_ip(route: str) -> Callable[[Request], None]:
+    # For unauthenticated routes. Only active once RATE_LIMIT_TRUSTED_PROXIES
+    # says which proxies to trust; login is also limited per username, which
+    # doesn't depend on it.
+    def dependency(request: Request) -> None:
+        client = client_ip(request)
+        if client is not None:
+            enforce(f"ip:{client}", route)
+    return dependency
+
+class ConcurrencyLimitMiddleware:
+    # Sheds load with a 503 once more requests are in flight than the database
+    # pool can serve, instead of letting them queue on pool checkout and drag
+    # every request's latency up with them.
+    def __init__(self, app, max_concurrent: int, queue_timeout: float, exempt_paths: Tuple[str, ...] = ("/", "/ready")):
+        self.app = app
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self.exempt_paths = exempt_paths
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._semaphore.release()
\ No newline at end of file
@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Set
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.event import EventVersion
+
+# Keep DELETE ... WHERE id IN (...) statements well under driver parameter limits
+DELETE_CHUNK_SIZE = 500
+
+class RetentionPolicy:
+    def __init__(self, keep_all_days: int, daily_until_days: int):
+        if keep_all_days < 0 or daily_until_days < keep_all_days:
+            raise ValueError("Retention requires 0 <= keep_all_days <= daily_until_days")
+        self.keep_all = timedelta(days=keep_all_days)
+        self.daily_until = timedelta(days=daily_until_days)
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        return cls(
+            keep_all_days=settings.VERSION_RETENTION_KEEP_ALL_DAYS,
+            daily_until_days=settings.VERSION_RETENTION_DAILY_UNTIL_DAYS
+        )
+
+    def bucket(self, created_at: datetime, now: datetime) -> Optional[Hashable]:
+        # None means "always keep"; otherwise only the newest version per bucket survives
+        age = now - created_at
+        if age < self.keep_all:
+            return None
+        if age < self.daily_until:
+            return ("day", created_at.date())
+        return ("month", created_at.year, created_at.month)
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def select_versions_to_keep(versions: Sequence[Any], policy: RetentionPolicy, now: datetime) -> Set[int]:
+    # `versions` are rows with id, version_number and created_at, ordered by version_number
+    if len(versions) <= 2:
+        return {v.id for v in versions}
+
+    keep = {versions[0].id, versions[-1].id}
+    newest_in_bucket: Dict[Hashable, Any] = {}
+    for version in versions:
+        bucket = policy.bucket(_as_utc(version.created_at), now) if version.created_at else None
+        if bucket is None:
+            keep.add(version.id)
+        else:
+            newest_in_bucket[bucket] = version  # ascending order, so the last one wins
+    keep.update(v.id for v in newest_in_bucket.values())
+    return keep
+
+def compact_versions(
+    db: Session,
+    policy: Optional[RetentionPolicy] = None,
+    dry_run: bool = False,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    policy = policy or RetentionPolicy.from_settings()
+    batch_size = batch_size or settings.VERSION_COMPACTION_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+    started = time.monotonic()
+
+    # Only events with more than two versions can lose anything
+    candidates = db.query(EventVersion.event_id).group_by(
+        EventVersion.event_id
+    ).having(func.count(EventVersion.id) > 2)
+    total_events = candidates.count()
+
+    stats = {
+        "dry_run": dry_run,
+        "events_scanned": 0,
+        "events_compacted": 0,
+        "versions_scanned": 0,
+        "versions_deleted": 0,
+        "versions_kept": 0,
+    }
+    last_event_id = 0
+    while True:
+        event_ids = [
+            row.event_id for row in candidates.filter(
+                EventVersion.event_id > last_event_id
+            ).order_by(EventVersion.event_id).limit(batch_size).all()
+        ]
+        if not event_ids:
+            break
+        last_event_id = event_ids[-1]
+
+        rows = db.query(
+            EventVersion.id,
+            EventVersion.event_id,
+            EventVersion.version_number,
+            EventVersion.created_at,
+            EventVersion.compacted_count
+        ).filter(
+            EventVersion.event_id.in_(event_ids)
+        ).order_by(EventVersion.event_id, EventVersion.version_number).all()
+
+        by_event: Dict[int, List[Any]] = {}
+        for row in rows:
+            by_event.setdefault(row.event_id, []).append(row)
+
+        doomed: List[int] = []
+        merged: List[Dict[str, int]] = []
+        for versions in by_event.values():
+            keep = select_versions_to_keep(versions, policy, now)
+            stats["versions_scanned"] += len(versions)
+            stats["versions_kept"] += len(keep)
+            if len(keep) == len(versions):
+                continue
+            stats["events_compacted"] += 1
+
+            # Each kept version absorbs the pruned versions that came before it
+            folded = 0
+            for version in versions:
+                if version.id not in keep:
+                    doomed.append(version.id)
+                    folded += 1 + (version.compacted_count or 0)
+                elif folded:
+                    merged.append({"id": version.id, "compacted_count": (version.compacted_count or 0) + folded})
+                    folded = 0
+
+        stats["events_scanned"] += len(event_ids)
+        stats["versions_deleted"] += len(doomed)
+
+        if not dry_run and doomed:
+            for i in range(0, len(doomed), DELETE_CHUNK_SIZE):
+                db.execute(
+                    delete(EventVersion)
+                    .where(EventVersion.id.in_(doomed[i:i + DELETE_CHUNK_SIZE]))
+                    .execution_options(synchronize_session=False)
+                )
+            if merged:
+                db.execute(update(EventVersion), merged)
+            db.commit()
+
+        if progress:
+            progress(stats["events_scanned"], total_events)
+
+    stats["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return stats
\ No newline at end of file
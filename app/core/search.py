@@ -0,0 +1,114 @@
+import base64
+import json
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, and_, cast, column, func, literal_column, or_, table, text
+from sqlalchemy.orm import Query, Session
+
+from app.models.event import Event
+
+# Title matches outrank location matches, which outrank description matches
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+events_fts = table("events_fts", column("rowid"))
+
+class InvalidCursor(ValueError):
+    pass
+
+class SearchNotSupported(Exception):
+    pass
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+def reindex_events(db: Session, first_id: int, last_id: int) -> None:
+    # Rebuilds the search entries for an id range from the rows in `events`;
+    # callers flush their changes first and commit along with them.
+    params = {"first_id": first_id, "last_id": last_id}
+    dialect = _dialect(db)
+    if dialect == "postgresql":
+        db.execute(text(
+            f"UPDATE events SET search_vector = {POSTGRES_VECTOR_SQL} "
+            "WHERE id BETWEEN :first_id AND :last_id"
+        ), params)
+    elif dialect == "sqlite":
+        db.execute(text("DELETE FROM events_fts WHERE rowid BETWEEN :first_id AND :last_id"), params)
+        db.execute(text(
+            "INSERT INTO events_fts (rowid, title, description, location) "
+            "SELECT id, coalesce(title, ''), coalesce(description, ''), coalesce(location, '') FROM events "
+            "WHERE id BETWEEN :first_id AND :last_id AND deleted_at IS NULL"
+        ), params)
+
+def index_event(db: Session, event: Event) -> None:
+    reindex_events(db, event.id, event.id)
+
+def remove_event(db: Session, event_id: int) -> None:
+    # On Postgres the vector is deleted along with the row
+    if _dialect(db) == "sqlite":
+        db.execute(text("DELETE FROM events_fts WHERE rowid = :id"), {"id": event_id})
+
+def encode_cursor(rank: float, event_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, event_id]).encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(event_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input can never be parsed as FTS5 query syntax
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", q))
+
+def search_events(
+    db: Session,
+    events: Query,
+    q: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Event], Optional[str]]:
+    # `events` is the caller's access-filtered query; results are ordered by
+    # relevance (higher rank first) and paginated by (rank, id) keyset
+    dialect = _dialect(db)
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", q)
+        vector = literal_column("events.search_vector")
+        # float8 so the rank survives the round trip through the cursor exactly
+        rank = cast(func.ts_rank(vector, tsquery), Float)
+        query = events.filter(vector.op("@@")(tsquery))
+    elif dialect == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return [], None
+        # Column weights (title, description, location) mirror the Postgres setweight
+        # classes; bm25 is lower-is-better so it is negated
+        rank = -func.bm25(literal_column("events_fts"), 10.0, 2.0, 5.0)
+        query = events.join(events_fts, events_fts.c.rowid == Event.id).filter(
+            text("events_fts MATCH :match").bindparams(match=match)
+        )
+    else:
+        raise SearchNotSupported(f"Full-text search is not supported on {dialect}")
+
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            rank < after_rank,
+            and_(rank == after_rank, Event.id < after_id)
+        ))
+
+    rows = query.add_columns(rank.label("rank")).order_by(
+        rank.desc(), Event.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_event, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_event.id)
+    return [event for event, _ in rows], next_cursor
\ No newline at end of file
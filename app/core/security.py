@@ -50,4 +50,15 @@ async def verify_token(token: str = Depends(oauth2_scheme)) -> TokenData:
             role=UserRole(role) if role else None
         )
     except JWTError:
-        raise credentials_exception 
\ No newline at end of file
+        raise credentials_exception 
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    # Username from an "Authorization: Bearer ..." header, or None. Used for
+    # routing decisions only; authentication still goes through verify_token.
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
\ No newline at end of file
@@ -0,0 +1,82 @@
+from typing import Any, Dict
+
+from sqlalchemy import func
+
+from app.config import settings
+from app.core.access import accessible_events
+from app.core.jobs import JobContext, job_handler, periodic_job
+from app.core.purge import enqueue_stale_purges, purge_event
+from app.core.retention import RetentionPolicy, compact_versions
+from app.core.search import reindex_events
+from app.models.event import Event
+from app.schemas.event import Event as EventSchema
+
+# Importing this module registers every job handler with the worker pool
+
+EXPORT_PART_SIZE = 500
+
+@job_handler("export_events")
+def export_events(ctx: JobContext) -> Dict[str, Any]:
+    # Written in parts of EXPORT_PART_SIZE events (GET /api/jobs/{id}/output),
+    # each committed before the next is read, so memory stays flat
+    query = accessible_events(ctx.db, ctx.payload["user_id"])
+    total = query.count()
+    part_size = ctx.payload.get("part_size", EXPORT_PART_SIZE)
+
+    ctx.clear_output()
+    exported, parts, last_id = 0, 0, 0
+    while True:
+        events = query.filter(Event.id > last_id).order_by(Event.id).limit(part_size).all()
+        if not events:
+            break
+        last_id = events[-1].id
+        ctx.write_output(parts, [EventSchema.model_validate(event).model_dump(mode="json") for event in events])
+        ctx.db.commit()
+        parts += 1
+        exported += len(events)
+        ctx.report_progress(exported, total)
+
+    ctx.report_progress(exported, exported, "Export complete")
+    return {"count": exported, "parts": parts}
+
+@job_handler("compact_versions")
+def compact_event_versions(ctx: JobContext) -> Dict[str, Any]:
+    policy = RetentionPolicy.from_settings()
+    if "keep_all_days" in ctx.payload or "daily_until_days" in ctx.payload:
+        policy = RetentionPolicy(
+            keep_all_days=ctx.payload.get("keep_all_days", settings.VERSION_RETENTION_KEEP_ALL_DAYS),
+            daily_until_days=ctx.payload.get("daily_until_days", settings.VERSION_RETENTION_DAILY_UNTIL_DAYS)
+        )
+    return compact_versions(
+        ctx.db,
+        policy=policy,
+        dry_run=ctx.payload.get("dry_run", False),
+        batch_size=ctx.payload.get("batch_size"),
+        progress=ctx.report_progress
+    )
+
+@job_handler("purge_event")
+def purge_deleted_event(ctx: JobContext) -> Dict[str, Any]:
+    stats = purge_event(
+        ctx.db,
+        ctx.payload["event_id"],
+        progress=lambda removed: ctx.report_progress(removed, message="Removing versions and permissions")
+    )
+    removed = stats["versions_deleted"] + stats["permissions_deleted"]
+    ctx.report_progress(removed, removed, "Purge complete")
+    return stats
+
+@periodic_job("sweep_deleted_events", settings.PURGE_SWEEP_INTERVAL_SECONDS)
+def sweep_deleted_events(ctx: JobContext) -> Dict[str, Any]:
+    return {"purges_enqueued": enqueue_stale_purges(ctx.db)}
+
+@job_handler("rebuild_search_index")
+def rebuild_search_index(ctx: JobContext) -> Dict[str, Any]:
+    # Backfills the full-text index, e.g. after restoring a dump or bulk loading rows
+    batch_size = ctx.payload.get("batch_size", 5000)
+    max_id = ctx.db.query(func.max(Event.id)).scalar() or 0
+    for first_id in range(1, max_id + 1, batch_size):
+        reindex_events(ctx.db, first_id, first_id + batch_size - 1)
+        ctx.db.commit()
+        ctx.report_progress(min(first_id + batch_size - 1, max_id), max_id)
+    return {"max_event_id": max_id}
\ No newline at end of file
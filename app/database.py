@@ -1,18 +1,120 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Select
 
 from app.config import settings
-
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.core.security import token_subject
 
 Base = declarative_base()
 
+_engine: Optional[Engine] = None
+_replicas: Optional[List[Engine]] = None
+_engine_lock = threading.Lock()
+
+def _engine_options(uri: str) -> dict:
+    options = {"pool_pre_ping": True}
+    if not uri.startswith("sqlite"):
+        options.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+    return options
+
+def get_engine() -> Engine:
+    # Built on first use, so importing the app (and every worker boot) never
+    # touches the database. Schema changes are applied by `alembic upgrade head`.
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **_engine_options(settings.SQLALCHEMY_DATABASE_URI))
+                if settings.DB_AUTO_CREATE_TABLES:
+                    Base.metadata.create_all(bind=engine)
+                _engine = engine
+    return _engine
+
+def get_replica_engines() -> List[Engine]:
+    global _replicas
+    if _replicas is None:
+        with _engine_lock:
+            if _replicas is None:
+                _replicas = [create_engine(uri, **_engine_options(uri)) for uri in settings.replica_uris]
+    return _replicas
+
+_round_robin = itertools.count()
+
+def choose_replica() -> Optional[Engine]:
+    replicas = get_replica_engines()
+    if not replicas:
+        return None
+    if settings.REPLICA_SELECTION == "least_busy":
+        return min(replicas, key=lambda engine: getattr(engine.pool, "checkedout", lambda: 0)())
+    return replicas[next(_round_robin) % len(replicas)]
+
+class StickinessTracker:
+    # Remembers who wrote recently so their next reads see their own writes.
+    # Per process: with several API workers, a replica can still lag behind a
+    # write made through another worker for up to the replication delay.
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._until[key] = now + self.window_seconds
+            if len(self._until) > 10000:
+                self._until = {k: v for k, v in self._until.items() if v > now}
+
+    def is_sticky(self, key: str) -> bool:
+        return self._until.get(key, 0.0) > time.monotonic()
+
+read_your_writes = StickinessTracker(settings.REPLICA_STICKINESS_SECONDS)
+
+class RoutingSession(Session):
+    # Plain SELECTs go to the replica chosen for this session (if any);
+    # flushes and INSERT/UPDATE/DELETE statements always use the primary.
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and not self._flushing and isinstance(clause, Select):
+            return replica
+        if self.bind is None:
+            return get_engine()
+        return super().get_bind(mapper, clause=clause, **kw)
+
+def use_primary(db: Session) -> None:
+    db.info.pop("replica", None)
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    # Once this session has written, its later reads must see the write
+    use_primary(session)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    key = session.info.get("sticky_key")
+    if key:
+        read_your_writes.mark(key)
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
 # Dependency
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    key = token_subject(request.headers.get("Authorization"))
+    if request.method in ("GET", "HEAD"):
+        if not (key and read_your_writes.is_sticky(key)):
+            db.info["replica"] = choose_replica()
+    elif key:
+        db.info["sticky_key"] = key
+        read_your_writes.mark(key)
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
\ No newline at end of file
@@ -0,0 +1,350 @@
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.search import reindex_events
+from app.database import Base
+from app.models import user, event, permission, job  # noqa: F401  Import all models
+from app.models.event import Event, EventVersion
+from app.models.permission import EventPermission
+from app.models.user import User
+
+# Synthetic data for benchmarking. Rows are generated lazily in chunks and bulk
+# loaded (COPY on Postgres, executemany on SQLite), so memory use is bounded by
+# --chunk-size no matter how large the dataset is. The same --seed, volumes and
+# --reference-time always produce the same rows.
+
+USER_COLUMNS = ("id", "email", "username", "hashed_password", "role", "is_active", "created_at", "updated_at")
+EVENT_COLUMNS = ("id", "title", "description", "start_time", "end_time", "location", "is_recurring",
+                 "recurrence_pattern", "owner_id", "created_at", "updated_at", "deleted_at")
+VERSION_COLUMNS = ("id", "event_id", "version_number", "data", "created_by", "created_at", "compacted_count")
+PERMISSION_COLUMNS = ("id", "event_id", "user_id", "role")
+
+# bcrypt hash of "password123", shared by every generated user so that runs stay
+# reproducible and generation doesn't pay for one bcrypt round per user
+PASSWORD_HASH = "$2b$12$asyZtCIaCb4eT4hs4tKxZelbdObtq5Rq.LvKsU7GZb9budtyDgWz."
+
+TOPICS = ["Team", "Project", "Client", "Budget", "Design", "Sprint", "Hiring", "Product", "Quarterly",
+          "Marketing", "Security", "Infrastructure", "Roadmap", "Board", "Customer", "Release"]
+KINDS = ["Meeting", "Review", "Sync", "Planning", "Retrospective", "Workshop", "Call", "Standup",
+         "Demo", "Interview", "Offsite", "Kickoff", "Lunch", "Training"]
+WORDS = ["agenda", "notes", "follow", "up", "decisions", "blockers", "metrics", "launch", "timeline",
+         "owners", "risks", "budget", "feedback", "goals", "priorities", "staffing", "contract", "vendor",
+         "migration", "outage", "postmortem", "hiring", "pipeline", "onboarding", "quarter", "targets"]
+LOCATIONS = ["Conference Room A", "Conference Room B", "Virtual", "Zoom", "Google Meet", "Cafeteria",
+             "Head Office", "Board Room", "Lab 3", "Auditorium", None]
+
+class Volumes:
+    def __init__(self, users: int, events: int, versions: int, share_fanout: float):
+        if users < 1 or events < 0:
+            raise ValueError("Need at least one user and a non-negative number of events")
+        self.users = users
+        self.events = events
+        self.versions = max(versions, events)  # every event has its initial version
+        self.share_fanout = share_fanout
+
+def _geometric(rng: random.Random, mean: float) -> int:
+    # Number of failures before a success with the given mean (0 when mean <= 0)
+    if mean <= 0:
+        return 0
+    p = 1.0 / (1.0 + mean)
+    count = 0
+    while rng.random() > p:
+        count += 1
+    return count
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+class DatasetGenerator:
+    def __init__(self, volumes: Volumes, seed: int, first_ids: Dict[str, int], now: datetime):
+        self.volumes = volumes
+        self.rng = random.Random(seed)
+        self.first_ids = first_ids
+        self.now = now
+        self.next_version_id = first_ids["event_versions"]
+        self.next_permission_id = first_ids["event_permissions"]
+
+    def users(self) -> Iterator[Tuple]:
+        rng = self.rng
+        first = self.first_ids["users"]
+        for user_id in range(first, first + self.volumes.users):
+            created = self.now - timedelta(days=rng.uniform(0, 730))
+            role = "VIEWER" if rng.random() < 0.8 else rng.choice(["EDITOR", "OWNER"])
+            yield (user_id, f"user{user_id}@example.com", f"user{user_id}", PASSWORD_HASH,
+                   role, True, created, created)
+
+    def _pick_user(self) -> int:
+        # Skewed activity: a small share of users own most of the events
+        index = int(self.volumes.users * (self.rng.random() ** 3))
+        return self.first_ids["users"] + min(index, self.volumes.users - 1)
+
+    def event_chunks(self, chunk_size: int) -> Iterator[Tuple[List[Tuple], List[Tuple], List[Tuple]]]:
+        rng = self.rng
+        volumes = self.volumes
+        extra_versions_mean = (volumes.versions - volumes.events) / volumes.events if volumes.events else 0
+        first = self.first_ids["events"]
+        events: List[Tuple] = []
+        versions: List[Tuple] = []
+        permissions: List[Tuple] = []
+
+        for event_id in range(first, first + volumes.events):
+            owner_id = self._pick_user()
+            created = self.now - timedelta(days=rng.uniform(0, 365))
+            start = created + timedelta(days=rng.uniform(0, 120), hours=rng.randint(7, 18))
+            start = start.replace(minute=rng.choice([0, 15, 30, 45]), second=0, microsecond=0)
+            end = start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120, 240]))
+            recurring = rng.random() < 0.15
+            data = {
+                "title": f"{rng.choice(TOPICS)} {rng.choice(KINDS)}",
+                "description": _sentence(rng, rng.randint(4, 40)),
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+                "location": rng.choice(LOCATIONS),
+                "is_recurring": recurring,
+                "recurrence_pattern": {"frequency": rng.choice(["daily", "weekly", "monthly"]),
+                                       "interval": rng.randint(1, 4)} if recurring else None,
+            }
+
+            # Version history: the initial snapshot plus edits spread after creation
+            version_time = created
+            version_count = 1 + _geometric(rng, extra_versions_mean)
+            for number in range(1, version_count + 1):
+                if number > 1:
+                    # Edits never land after the reference time, even for recent events
+                    version_time = min(version_time + timedelta(hours=rng.expovariate(1 / 72)), self.now)
+                    field = rng.choice(["title", "description", "location"])
+                    if field == "title":
+                        data["title"] = f"{rng.choice(TOPICS)} {rng.choice(KINDS)}"
+                    elif field == "description":
+                        data["description"] = _sentence(rng, rng.randint(4, 40))
+                    else:
+                        data["location"] = rng.choice(LOCATIONS)
+                versions.append((self.next_version_id, event_id, number, dict(data),
+                                 owner_id, version_time, 0))
+                self.next_version_id += 1
+
+            updated = version_time if version_count > 1 else None
+            events.append((event_id, data["title"], data["description"], start, end, data["location"],
+                           recurring, data["recurrence_pattern"], owner_id, created, updated, None))
+
+            # Sharing fan-out: the owner permission plus a geometric number of collaborators
+            shared_with = {owner_id}
+            permissions.append((self.next_permission_id, event_id, owner_id, "OWNER"))
+            self.next_permission_id += 1
+            for _ in range(min(_geometric(rng, volumes.share_fanout), volumes.users - 1)):
+                user_id = self._pick_user()
+                if user_id in shared_with:
+                    continue
+                shared_with.add(user_id)
+                role = "VIEWER" if rng.random() < 0.7 else "EDITOR"
+                permissions.append((self.next_permission_id, event_id, user_id, role))
+                self.next_permission_id += 1
+
+            if len(events) >= chunk_size:
+                yield events, versions, permissions
+                events, versions, permissions = [], [], []
+
+        if events:
+            yield events, versions, permissions
+
+def _chunks(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    chunk: List[Tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class BulkWriter(ABC):
+    def __init__(self, engine: Engine):
+        self.connection = engine.raw_connection()
+
+    @abstractmethod
+    def write(self, table: str, columns: Sequence[str], rows: List[Tuple]) -> None:
+        ...
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def finish(self) -> None:
+        self.connection.close()
+
+class PostgresCopyWriter(BulkWriter):
+    def _value(self, value: Any) -> Any:
+        if value is None:
+            return None  # csv writes an empty unquoted field, which COPY reads as NULL
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        return value
+
+    def write(self, table: str, columns: Sequence[str], rows: List[Tuple]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([self._value(value) for value in row])
+        buffer.seek(0)
+        cursor = self.connection.cursor()
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.close()
+
+    def finish(self) -> None:
+        # COPY with explicit ids leaves the serial sequences behind
+        cursor = self.connection.cursor()
+        for table in ("users", "events", "event_versions", "event_permissions"):
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT coalesce(max(id), 1) FROM {table}))"
+            )
+        self.connection.commit()
+        cursor.close()
+        super().finish()
+
+class SqliteExecutemanyWriter(BulkWriter):
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        cursor = self.connection.cursor()
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.close()
+
+    def _value(self, value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, datetime):
+            # Same storage format SQLAlchemy uses for DateTime on SQLite
+            return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+        return value
+
+    def write(self, table: str, columns: Sequence[str], rows: List[Tuple]) -> None:
+        cursor = self.connection.cursor()
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [[self._value(value) for value in row] for row in rows]
+        )
+        cursor.close()
+
+class Throughput:
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.started = time.monotonic()
+
+    def record(self, table: str, rows: int, seconds: float) -> None:
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self.seconds[table] = self.seconds.get(table, 0.0) + seconds
+
+    def report(self) -> str:
+        lines = []
+        for table, rows in self.rows.items():
+            rate = rows / self.seconds[table] if self.seconds[table] else 0
+            lines.append(f"  {table:<18} {rows:>12,} rows  {rate:>12,.0f} rows/s (write time)")
+        total_rows = sum(rows for table, rows in self.rows.items() if table != "search index")
+        elapsed = time.monotonic() - self.started
+        lines.append(f"  {'total':<18} {total_rows:>12,} rows  {total_rows / elapsed:>12,.0f} rows/s "
+                     f"({elapsed:.1f}s wall clock, including generation)")
+        return "\n".join(lines)
+
+def _first_ids(engine: Engine) -> Dict[str, int]:
+    first_ids = {}
+    with engine.connect() as connection:
+        for model in (User, Event, EventVersion, EventPermission):
+            max_id = connection.execute(select(func.max(model.id))).scalar() or 0
+            first_ids[model.__tablename__] = max_id + 1
+    return first_ids
+
+def generate(
+    engine: Engine,
+    volumes: Volumes,
+    seed: int,
+    chunk_size: int,
+    reference_time: datetime,
+    build_search_index: bool = True
+) -> Throughput:
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        writer: BulkWriter = PostgresCopyWriter(engine)
+    elif dialect == "sqlite":
+        writer = SqliteExecutemanyWriter(engine)
+    else:
+        raise SystemExit(f"Unsupported database: {dialect}")
+
+    generator = DatasetGenerator(volumes, seed, _first_ids(engine), reference_time)
+    throughput = Throughput()
+
+    def load(table: str, columns: Sequence[str], rows: List[Tuple]) -> None:
+        started = time.monotonic()
+        writer.write(table, columns, rows)
+        writer.commit()
+        throughput.record(table, len(rows), time.monotonic() - started)
+
+    try:
+        for rows in _chunks(generator.users(), chunk_size):
+            load("users", USER_COLUMNS, rows)
+
+        search_db = Session(bind=engine)
+        for events, versions, permissions in generator.event_chunks(chunk_size):
+            load("events", EVENT_COLUMNS, events)
+            load("event_versions", VERSION_COLUMNS, versions)
+            load("event_permissions", PERMISSION_COLUMNS, permissions)
+            if build_search_index:
+                started = time.monotonic()
+                reindex_events(search_db, events[0][0], events[-1][0])
+                search_db.commit()
+                throughput.record("search index", len(events), time.monotonic() - started)
+            print(f"  events {events[-1][0] - generator.first_ids['events'] + 1:,}/{volumes.events:,}", flush=True)
+        search_db.close()
+    finally:
+        writer.finish()
+    return throughput
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic NeoFi dataset for benchmarking")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--versions", type=int, default=50000,
+                        help="approximate total number of event versions (at least one per event)")
+    parser.add_argument("--share-fanout", type=float, default=3.0,
+                        help="mean number of users each event is shared with besides its owner")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reference-time", type=datetime.fromisoformat, default=None,
+                        help="ISO timestamp that generated dates are relative to (default: today 00:00 UTC)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="events (or users) per bulk load")
+    parser.add_argument("--database-url", default=settings.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--create-tables", action="store_true",
+                        help="create missing tables first (otherwise run `alembic upgrade head`)")
+    parser.add_argument("--skip-search-index", action="store_true",
+                        help="don't populate the full-text index (queue rebuild_search_index later)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    volumes = Volumes(args.users, args.events, args.versions, args.share_fanout)
+    reference_time = args.reference_time or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if reference_time.tzinfo is None:
+        reference_time = reference_time.replace(tzinfo=timezone.utc)
+    print(f"Generating {volumes.users:,} users, {volumes.events:,} events, ~{volumes.versions:,} versions "
+          f"(seed {args.seed}) into {engine.url.render_as_string(hide_password=True)}")
+    throughput = generate(engine, volumes, args.seed, args.chunk_size, reference_time, not args.skip_search_index)
+    print(throughput.report())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,45 +1,109 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from app.routers import auth, events
-from app.database import engine, Base
-from app.models import user, event, permission  # Import all models
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from sqlalchemy import text
+from app.routers import auth, events, jobs
+from app.database import get_engine
+from app.models import user, event, permission, job  # Import all models
+from app.config import settings
+from app.core.jobs import WorkerPool
+from app.core.ratelimit import ConcurrencyLimitMiddleware
+from app.core.compression import GZipMiddleware
+from app.core.metrics import metrics
+from app.core import tasks  # noqa: F401  Registers job handlers
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-app = FastAPI(
-    title="NeoFi Event Management API",
-    description="A collaborative event management system API",
-    version="1.0.0",
-    openapi_tags=[
-        {
-            "name": "Authentication",
-            "description": "Operations with user authentication",
-        },
-        {
-            "name": "Events",
-            "description": "Operations with events",
-        }
-    ]
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(events.router, prefix="/api/events", tags=["Events"])
-
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to NeoFi Event Management API"} 
\ No newline at end of file
+def create_app() -> FastAPI:
+    # Building the app does no I/O: the database engine is created on first
+    # use and the schema is managed by Alembic migrations at deploy time.
+    app = FastAPI(
+        title="NeoFi Event Management API",
+        description="A collaborative event management system API",
+        version="1.0.0",
+        openapi_tags=[
+            {
+                "name": "Authentication",
+                "description": "Operations with user authentication",
+            },
+            {
+                "name": "Events",
+                "description": "Operations with events",
+            },
+            {
+                "name": "Jobs",
+                "description": "Status of background jobs",
+            }
+        ]
+    )
+
+    # Shed load before the database pool is exhausted (inside CORS so browsers can read the 503)
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+        queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+    )
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Outermost, so every response (including errors) is measured and compressed
+    if settings.GZIP_ENABLED:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=settings.GZIP_MINIMUM_SIZE,
+            compresslevel=settings.GZIP_COMPRESS_LEVEL,
+        )
+
+    # Include routers
+    app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
+    app.include_router(events.router, prefix="/api/events", tags=["Events"])
+    app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+
+    # Background job workers; heavier deployments run `python -m app.worker` instead
+    job_workers = WorkerPool(settings.JOB_INPROCESS_WORKERS)
+    app.state.job_workers = job_workers
+
+    @app.on_event("startup")
+    def start_job_workers():
+        # Only starts threads: they connect on their first poll, and back off
+        # while the database is unreachable or not migrated yet
+        if settings.JOB_INPROCESS_WORKERS > 0:
+            job_workers.start()
+
+    @app.on_event("shutdown")
+    def stop_job_workers():
+        job_workers.stop(timeout=5)
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to NeoFi Event Management API"}
+
+    @app.get("/ready")
+    def readiness():
+        # Unlike "/", only succeeds once the database is reachable
+        try:
+            with get_engine().connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database unavailable"
+            )
+        return {"status": "ready"}
+
+    @app.get("/metrics")
+    def read_metrics():
+        # Counters for this process only
+        return metrics.snapshot()
+
+    return app
+
+app = create_app()
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .user import User
 from .event import Event, EventVersion
-from .permission import EventPermission 
\ No newline at end of file
+from .permission import EventPermission
+from .job import Job, JobOutput
\ No newline at end of file
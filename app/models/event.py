@@ -1,10 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, Index, DDL, event
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Live-event lookups only touch rows that have not been soft deleted,
+        # and the purge sweep finds old tombstones through deleted_at (partial,
+        # so live rows cost nothing to index)
+        Index(
+            "ix_events_owner_id_live", "owner_id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL")
+        ),
+        Index(
+            "ix_events_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -17,6 +32,7 @@ class Event(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
 
     owner = relationship("User", back_populates="events")
     versions = relationship("EventVersion", back_populates="event")
@@ -24,6 +40,9 @@ class Event(Base):
 
 class EventVersion(Base):
     __tablename__ = "event_versions"
+    __table_args__ = (
+        Index("ix_event_versions_event_id_version_number", "event_id", "version_number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"))
@@ -31,6 +50,23 @@ class EventVersion(Base):
     data = Column(JSON)
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Number of earlier versions folded into this one by history compaction
+    compacted_count = Column(Integer, default=0, nullable=False)
 
     event = relationship("Event", back_populates="versions")
-    user = relationship("User") 
\ No newline at end of file
+    user = relationship("User") 
+
+# Full-text search storage lives outside the mapped columns (see app/core/search.py):
+# a tsvector column with a GIN index on Postgres, an FTS5 table keyed by event id on SQLite.
+event.listen(Event.__table__, "after_create", DDL(
+    "ALTER TABLE events ADD COLUMN search_vector tsvector"
+).execute_if(dialect="postgresql"))
+event.listen(Event.__table__, "after_create", DDL(
+    "CREATE INDEX ix_events_search_vector ON events USING GIN (search_vector)"
+).execute_if(dialect="postgresql"))
+event.listen(Event.__table__, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(title, description, location, tokenize='porter unicode61')"
+).execute_if(dialect="sqlite"))
+event.listen(Event.__table__, "before_drop", DDL(
+    "DROP TABLE IF EXISTS events_fts"
+).execute_if(dialect="sqlite"))
\ No newline at end of file
@@ -0,0 +1,59 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+import enum
+from app.database import Base
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers poll for the oldest runnable job of a given status
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+
+    progress_current = Column(Integer, default=0)
+    progress_total = Column(Integer, nullable=True)
+    progress_message = Column(String, nullable=True)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=1, nullable=False)
+    run_after = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    user = relationship("User")
+
+class JobOutput(Base):
+    # Large job output (e.g. an export), written in parts so neither the worker
+    # nor the status endpoint ever holds all of it; Job.result keeps a summary
+    __tablename__ = "job_outputs"
+    __table_args__ = (
+        Index("ix_job_outputs_job_id_part", "job_id", "part", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    part = Column(Integer, nullable=False)
+    data = Column(JSON, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -10,6 +10,9 @@ class Role(str, enum.Enum):
 
 class EventPermission(Base):
     __tablename__ = "event_permissions"
+    __table_args__ = (
+        Index("ix_event_permissions_event_id_user_id", "event_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"))
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Form, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
 from typing import Any
 
+from app.core.ratelimit import enforce, limit_by_ip
 from app.core.security import create_access_token, verify_password, get_password_hash, verify_token
 from app.schemas.user import UserCreate, User, Token, UserRole
 from app.models.user import User as UserModel
@@ -12,10 +13,16 @@ from app.config import settings
 
 router = APIRouter()
 
+def limit_by_username(route: str):
+    # Guesses against one account are limited wherever they come from
+    def dependency(username: str = Form()) -> None:
+        enforce(f"username:{username.lower()}", route)
+    return dependency
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-@router.post("/register", response_model=User)
+@router.post("/register", response_model=User, dependencies=[Depends(limit_by_ip("register"))])
 def register_user(user: UserCreate, db: Session = Depends(get_db)) -> Any:
     db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
     if db_user:
@@ -44,7 +51,7 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)) -> Any:
     db.refresh(db_user)
     return db_user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_by_ip("login")), Depends(limit_by_username("login"))])
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -69,7 +76,7 @@ async def login(
         "expires_at": datetime.utcnow() + expires_delta
     }
 
-@router.post("/refresh", response_model=Token)
+@router.post("/refresh", response_model=Token, dependencies=[Depends(limit_by_ip("refresh"))])
 async def refresh_token(
     current_token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
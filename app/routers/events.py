@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Any
-from datetime import datetime
+from typing import List, Any, Optional, Tuple
+from datetime import datetime, timezone
 
+from app.core.access import accessible_events, check_permission, event_audience
+from app.core.cache import get_event_list_cache, invalidate_event_lists
+from app.core.jobs import enqueue
+from app.core.metrics import metrics
+from app.core.ratelimit import enforce
+from app.core.search import InvalidCursor, SearchNotSupported, index_event, search_events
 from app.core.security import oauth2_scheme, verify_token
-from app.database import get_db
+from app.database import get_db, use_primary
 from app.models.user import User
 from app.models.event import Event, EventVersion
 from app.models.permission import EventPermission, Role
 from app.schemas.event import (
-    EventCreate, EventUpdate, Event as EventSchema,
+    EventBase, EventCreate, EventUpdate, Event as EventSchema,
     EventPermissionCreate, EventPermission as EventPermissionSchema,
-    EventVersion as EventVersionSchema, EventDiff
+    EventVersion as EventVersionSchema, EventDiff, EventSearchResults,
+    EVENT_FIELDS, event_list_adapter, sparse_event_model, sparse_event_list_adapter
 )
+from app.schemas.job import Job as JobSchema
 
 router = APIRouter()
 
@@ -23,6 +31,10 @@ async def get_current_user(
     try:
         token_data = await verify_token(token)
         user = db.query(User).filter(User.username == token_data.username).first()
+        if not user and db.info.get("replica") is not None:
+            # Accounts created moments ago may not have reached the replica yet
+            use_primary(db)
+            user = db.query(User).filter(User.username == token_data.username).first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,19 +48,35 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def check_permission(db: Session, event_id: int, user_id: int, required_role: Role) -> bool:
-    permission = db.query(EventPermission).filter(
-        EventPermission.event_id == event_id,
-        EventPermission.user_id == user_id
-    ).first()
-    
-    if not permission:
-        return False
-    
-    role_hierarchy = {Role.OWNER: 3, Role.EDITOR: 2, Role.VIEWER: 1}
-    return role_hierarchy[permission.role] >= role_hierarchy[required_role]
+def limit_by_user(route: str):
+    # Token bucket per user; see RATE_LIMIT_* in app/config.py
+    def dependency(current_user: User = Depends(get_current_user)) -> None:
+        enforce(f"user:{current_user.id}", route)
+    return dependency
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    # "?fields=title,start_time" -> ("id", "title", "start_time"); None means all fields
+    if fields is None:
+        return None
+    requested = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name and name not in requested:
+            requested.append(name)
+    unknown = [name for name in requested if name not in EVENT_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested"
+        )
+    if "id" not in requested:
+        requested.insert(0, "id")
+    metrics.inc("events_sparse_fieldset_requests_total")
+    return tuple(requested)
 
-@router.post("/", response_model=EventSchema)
+FIELDS_QUERY = Query(None, description="Comma-separated event fields to return, e.g. id,title,start_time,end_time")
+
+@router.post("/", response_model=EventSchema, dependencies=[Depends(limit_by_user("create_event"))])
 def create_event(
     event: EventCreate,
     db: Session = Depends(get_db),
@@ -80,48 +108,112 @@ def create_event(
         role=Role.OWNER
     )
     db.add(owner_permission)
+    index_event(db, db_event)
     db.commit()
+    invalidate_event_lists({current_user.id})
     
     return db_event
 
-@router.get("/", response_model=List[EventSchema])
+@router.get("/", response_model=List[EventSchema], dependencies=[Depends(limit_by_user("list_events"))])
 def list_events(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
-    events = db.query(Event).filter(
-        (Event.owner_id == current_user.id) |  # User is owner
-        (Event.id.in_(
-            db.query(EventPermission.event_id).filter(
-                EventPermission.user_id == current_user.id
-            )
-        ))  # User has permissions
-    ).offset(skip).limit(limit).all()
-    return events
+    selected = parse_fields(fields)
+    cache = get_event_list_cache()
+    key = (current_user.id, skip, limit, selected)
+    if cache is not None:
+        body = cache.get(key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        version = cache.version()
+
+    query = accessible_events(db, current_user.id)
+    if selected:
+        # Only the requested columns are selected and serialized
+        query = query.with_entities(*[getattr(Event, name) for name in selected])
+        adapter = sparse_event_list_adapter(selected)
+    else:
+        adapter = event_list_adapter
+    rows = query.offset(skip).limit(limit).all()
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    if cache is not None:
+        # A replica may not have caught up with a recently invalidated change
+        cache.put(key, body, version, from_replica=db.info.get("replica") is not None)
+    return Response(content=body, media_type="application/json")
 
-@router.get("/{event_id}", response_model=EventSchema)
+@router.get("/search", response_model=EventSearchResults, dependencies=[Depends(limit_by_user("search"))])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    try:
+        events, next_cursor = search_events(
+            db, accessible_events(db, current_user.id), q, limit, cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    except SearchNotSupported as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(e)
+        )
+    return {"items": events, "next_cursor": next_cursor}
+
+@router.post("/export", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(limit_by_user("export_events"))])
+def export_events(
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    # Runs on a background worker; poll /api/jobs/{id} for progress and the result
+    job = enqueue(db, "export_events", {"user_id": current_user.id}, created_by=current_user.id)
+    db.commit()
+    db.refresh(job)
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+@router.get("/{event_id}", response_model=EventSchema, dependencies=[Depends(limit_by_user("get_event"))])
 def get_event(
     event_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
+    selected = parse_fields(fields)
     if not check_permission(db, event_id, current_user.id, Role.VIEWER):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    query = db.query(Event).filter(Event.id == event_id, Event.deleted_at.is_(None))
+    if selected:
+        query = query.with_entities(*[getattr(Event, name) for name in selected])
+    event = query.first()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
+    if selected:
+        return Response(
+            content=sparse_event_model(selected).model_validate(event).model_dump_json(),
+            media_type="application/json"
+        )
     return event
 
-@router.put("/{event_id}", response_model=EventSchema)
+@router.put("/{event_id}", response_model=EventSchema, dependencies=[Depends(limit_by_user("update_event"))])
 def update_event(
     event_id: int,
     event_update: EventUpdate,
@@ -134,7 +226,7 @@ def update_event(
             detail="Not enough permissions"
         )
     
-    db_event = db.query(Event).filter(Event.id == event_id).first()
+    db_event = db.query(Event).filter(Event.id == event_id, Event.deleted_at.is_(None)).first()
     if not db_event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -172,11 +264,15 @@ def update_event(
     for field, value in event_update.dict(exclude_unset=True).items():
         setattr(db_event, field, value)
     
+    db.flush()
+    index_event(db, db_event)
+    audience = event_audience(db, db_event)
     db.commit()
+    invalidate_event_lists(audience)
     db.refresh(db_event)
     return db_event
 
-@router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(limit_by_user("delete_event"))])
 def delete_event(
     event_id: int,
     db: Session = Depends(get_db),
@@ -188,17 +284,22 @@ def delete_event(
             detail="Not enough permissions"
         )
     
-    db_event = db.query(Event).filter(Event.id == event_id).first()
+    db_event = db.query(Event).filter(Event.id == event_id, Event.deleted_at.is_(None)).first()
     if not db_event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
-    db.delete(db_event)
+    # Tombstone the event now; versions and permissions are removed in
+    # batches by a background job
+    audience = event_audience(db, db_event)
+    db_event.deleted_at = datetime.now(timezone.utc)
+    enqueue(db, "purge_event", {"event_id": event_id}, created_by=current_user.id)
     db.commit()
+    invalidate_event_lists(audience)
 
-@router.post("/{event_id}/share", response_model=EventPermissionSchema)
+@router.post("/{event_id}/share", response_model=EventPermissionSchema, dependencies=[Depends(limit_by_user("share_event"))])
 def share_event(
     event_id: int,
     permission: EventPermissionCreate,
@@ -206,7 +307,7 @@ def share_event(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     # Check if event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.query(Event).filter(Event.id == event_id, Event.deleted_at.is_(None)).first()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -240,10 +341,12 @@ def share_event(
     )
     db.add(db_permission)
     db.commit()
+    # Only the new user's list changes
+    invalidate_event_lists({permission.user_id})
     db.refresh(db_permission)
     return db_permission
 
-@router.get("/{event_id}/history", response_model=List[EventVersionSchema])
+@router.get("/{event_id}/history", response_model=List[EventVersionSchema], dependencies=[Depends(limit_by_user("get_event_history"))])
 def get_event_history(
     event_id: int,
     db: Session = Depends(get_db),
@@ -260,7 +363,7 @@ def get_event_history(
     ).order_by(EventVersion.version_number.desc()).all()
     return versions
 
-@router.get("/{event_id}/diff/{version1}/{version2}", response_model=List[EventDiff])
+@router.get("/{event_id}/diff/{version1}/{version2}", response_model=List[EventDiff], dependencies=[Depends(limit_by_user("get_version_diff"))])
 def get_version_diff(
     event_id: int,
     version1: int,
@@ -289,13 +392,17 @@ def get_version_diff(
             detail="Version not found"
         )
     
+    # Versions are full snapshots, so any two kept versions can be compared
+    # even when compaction has removed the ones in between. Only user-editable
+    # fields are compared: later snapshots also carry columns like id and
+    # created_at that the first one doesn't.
     diffs = []
-    for key in v1.data.keys():
-        if v1.data[key] != v2.data[key]:
+    for key in EventBase.model_fields:
+        if v1.data.get(key) != v2.data.get(key):
             diffs.append(EventDiff(
                 field=key,
-                old_value=v1.data[key],
-                new_value=v2.data[key]
+                old_value=v1.data.get(key),
+                new_value=v2.data.get(key)
             ))
     
     return diffs 
\ No newline at end of file
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Any
+
+from app.database import get_db
+from app.models.user import User
+from app.models.job import Job, JobOutput
+from app.routers.events import get_current_user, limit_by_user
+from app.schemas.job import Job as JobSchema, JobOutputPart
+
+router = APIRouter()
+
+def get_own_job(db: Session, job_id: int, user: User) -> Job:
+    job = db.query(Job).filter(Job.id == job_id).first()
+    # Jobs are only visible to the user who started them
+    if not job or job.created_by != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+@router.get("/{job_id}", response_model=JobSchema, dependencies=[Depends(limit_by_user("get_job"))])
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    return get_own_job(db, job_id, current_user)
+
+@router.get("/{job_id}/output", response_model=JobOutputPart, dependencies=[Depends(limit_by_user("get_job_output"))])
+def get_job_output(
+    job_id: int,
+    part: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    get_own_job(db, job_id, current_user)
+    output = db.query(JobOutput).filter(JobOutput.job_id == job_id, JobOutput.part == part).first()
+    if not output:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Output part not found"
+        )
+    parts = db.query(func.count(JobOutput.id)).filter(JobOutput.job_id == job_id).scalar()
+    return JobOutputPart(job_id=job_id, part=part, parts=parts, items=output.data)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from typing import Optional, Dict, Any, List, Tuple, Type
+from functools import lru_cache
 from datetime import datetime
 from app.models.permission import Role
 
@@ -36,6 +37,27 @@ class EventInDB(EventBase):
 class Event(EventInDB):
     pass
 
+EVENT_FIELDS = tuple(Event.model_fields)
+
+event_list_adapter = TypeAdapter(List[Event])
+
+@lru_cache(maxsize=128)
+def sparse_event_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    # Event restricted to `fields`, for responses to ?fields=
+    return create_model(
+        "SparseEvent",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (Event.model_fields[name].annotation, ...) for name in fields}
+    )
+
+@lru_cache(maxsize=128)
+def sparse_event_list_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(List[sparse_event_model(fields)])
+
+class EventSearchResults(BaseModel):
+    items: List[Event]
+    next_cursor: Optional[str] = None
+
 class EventPermissionCreate(BaseModel):
     user_id: int
     role: Role
@@ -54,6 +76,7 @@ class EventVersion(BaseModel):
     data: Dict[str, Any]
     created_by: int
     created_at: datetime
+    compacted_count: Optional[int] = 0
 
     class Config:
         from_attributes = True
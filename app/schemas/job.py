@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+from app.models.job import JobStatus
+
+class Job(BaseModel):
+    id: int
+    job_type: str
+    status: JobStatus
+    progress_current: int = 0
+    progress_total: Optional[int] = None
+    progress_message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobOutputPart(BaseModel):
+    job_id: int
+    part: int
+    parts: int
+    items: List[Any]
@@ -0,0 +1,34 @@
+import argparse
+import logging
+import signal
+import threading
+
+from app.config import settings
+from app.core.jobs import WorkerPool
+from app.core import tasks  # noqa: F401  Registers job handlers
+from app.models import user, event, permission, job  # noqa: F401  Import all models
+
+def main():
+    parser = argparse.ArgumentParser(description="Run NeoFi background job workers")
+    parser.add_argument("--workers", type=int, default=settings.JOB_WORKER_THREADS,
+                        help="number of worker threads")
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL_SECONDS,
+                        help="seconds to sleep when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    pool = WorkerPool(args.workers, poll_interval=args.poll_interval)
+    pool.start()
+    logging.info("Started %d job workers", args.workers)
+    stop.wait()
+
+    logging.info("Stopping job workers")
+    pool.stop()
+
+if __name__ == "__main__":
+    main()
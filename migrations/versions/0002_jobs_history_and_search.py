@@ -0,0 +1,101 @@
+"""Background jobs, version retention, soft delete and full-text search
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.core.search.POSTGRES_VECTOR_SQL
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Background jobs
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_type', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'SUCCEEDED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('progress_current', sa.Integer(), nullable=True),
+    sa.Column('progress_total', sa.Integer(), nullable=True),
+    sa.Column('progress_message', sa.String(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'], unique=False)
+    op.create_index('ix_jobs_status_run_after', 'jobs', ['status', 'run_after'], unique=False)
+
+    # Version retention
+    op.add_column('event_versions', sa.Column('compacted_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.create_index('ix_event_versions_event_id_version_number', 'event_versions', ['event_id', 'version_number'], unique=False)
+
+    # Soft delete
+    op.add_column('events', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_events_deleted_at', 'events', ['deleted_at'], unique=False)
+    op.create_index('ix_events_owner_id_live', 'events', ['owner_id'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'), sqlite_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_event_permissions_event_id_user_id', 'event_permissions', ['event_id', 'user_id'], unique=False)
+
+    # Full-text search, backfilled from existing rows
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE events ADD COLUMN search_vector tsvector")
+        op.execute(f"UPDATE events SET search_vector = {POSTGRES_VECTOR_SQL}")
+        op.execute("CREATE INDEX ix_events_search_vector ON events USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(title, description, location, tokenize='porter unicode61')")
+        op.execute(
+            "INSERT INTO events_fts (rowid, title, description, location) "
+            "SELECT id, coalesce(title, ''), coalesce(description, ''), coalesce(location, '') FROM events"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_events_search_vector")
+        op.execute("ALTER TABLE events DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS events_fts")
+
+    op.drop_index('ix_event_permissions_event_id_user_id', table_name='event_permissions')
+    op.drop_index('ix_events_owner_id_live', table_name='events')
+    op.drop_index('ix_events_deleted_at', table_name='events')
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_column('deleted_at')
+
+    op.drop_index('ix_event_versions_event_id_version_number', table_name='event_versions')
+    with op.batch_alter_table('event_versions') as batch_op:
+        batch_op.drop_column('compacted_count')
+
+    op.drop_index('ix_jobs_status_run_after', table_name='jobs')
+    op.drop_index('ix_jobs_id', table_name='jobs')
+    op.drop_table('jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
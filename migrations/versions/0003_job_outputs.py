@@ -0,0 +1,35 @@
+"""Job output parts
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_outputs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('part', sa.Integer(), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_outputs_job_id_part', 'job_outputs', ['job_id', 'part'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_outputs_job_id_part', table_name='job_outputs')
+    op.drop_table('job_outputs')
@@ -0,0 +1,30 @@
+"""Partial index on events.deleted_at
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only tombstones are looked up by deleted_at (the purge sweep)
+    op.drop_index('ix_events_deleted_at', table_name='events')
+    op.create_index('ix_events_deleted_at', 'events', ['deleted_at'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'), sqlite_where=sa.text('deleted_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_deleted_at', table_name='events')
+    op.create_index('ix_events_deleted_at', 'events', ['deleted_at'], unique=False)
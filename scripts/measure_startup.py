@@ -0,0 +1,95 @@
+"""Measure cold-start latency of the API.
+
+Each run starts a fresh interpreter and records:
+  import   - time to import app.main (module graph + create_app())
+  startup  - time to run the ASGI startup handlers
+  ready    - time for the first successful readiness check, i.e. the first
+             database connection (only with --check-db)
+
+Usage:
+    python scripts/measure_startup.py --runs 10
+    python scripts/measure_startup.py --runs 5 --check-db --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+asyncio.run(app.main.app.router.startup())
+t2 = time.perf_counter()
+timings = {"import": t1 - t0, "startup": t2 - t1}
+if CHECK_DB:
+    from app.main import app as api
+    ready = next(r.endpoint for r in api.routes if getattr(r, "path", None) == "/ready")
+    ready()
+    timings["ready"] = time.perf_counter() - t2
+asyncio.run(app.main.app.router.shutdown())
+print(json.dumps(timings))
+"""
+
+def run_probe(check_db: bool) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.replace("CHECK_DB", repr(check_db))],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Probe failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def slowest_imports(top: int) -> list:
+    # -X importtime writes "import time: self | cumulative | package" to stderr
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and startup time of app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check-db", action="store_true",
+                        help="also time the first readiness check (opens a DB connection)")
+    parser.add_argument("--top", type=int, default=0,
+                        help="list the N slowest imports by cumulative time")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    runs = [run_probe(args.check_db) for _ in range(args.runs)]
+    summary = {}
+    for phase in runs[0]:
+        values = sorted(run[phase] * 1000 for run in runs)
+        summary[phase] = {
+            "median_ms": round(statistics.median(values), 1),
+            "min_ms": round(values[0], 1),
+            "max_ms": round(values[-1], 1),
+        }
+
+    if args.json:
+        print(json.dumps({"runs": args.runs, "phases": summary}, indent=2))
+    else:
+        print(f"{args.runs} runs")
+        for phase, stats in summary.items():
+            print(f"  {phase:<8} median {stats['median_ms']:>8.1f} ms   min {stats['min_ms']:>8.1f} ms   max {stats['max_ms']:>8.1f} ms")
+
+    if args.top:
+        print("\nSlowest imports (cumulative):")
+        for cumulative_us, self_us, name in slowest_imports(args.top):
+            print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Local primary/replica setup backed by two SQLite files.
+
+Creates the schema in the primary file, then copies the primary into the
+replica every --lag seconds to simulate asynchronous replication. Run the
+API against both files in another terminal:
+
+    python scripts/sqlite_replica.py --primary primary.db --replica replica.db --lag 2
+
+    DATABASE_URL=sqlite:///primary.db \
+    DATABASE_REPLICA_URLS=sqlite:///replica.db \
+    uvicorn app.main:app --reload
+
+Writes followed by reads from the same user are served by the primary for
+REPLICA_STICKINESS_SECONDS; other reads see the replica, up to --lag old.
+"""
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def replicate(primary: str, replica: str) -> None:
+    source = sqlite3.connect(primary)
+    target = sqlite3.connect(replica)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a read replica with two SQLite files")
+    parser.add_argument("--primary", default="primary.db")
+    parser.add_argument("--replica", default="replica.db")
+    parser.add_argument("--lag", type=float, default=2.0, help="seconds between replica refreshes")
+    parser.add_argument("--once", action="store_true", help="migrate and copy once, then exit")
+    args = parser.parse_args()
+
+    primary = os.path.abspath(args.primary)
+    replica = os.path.abspath(args.replica)
+
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{primary}")
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, env=env, check=True)
+    replicate(primary, replica)
+    print(f"DATABASE_URL=sqlite:///{primary}")
+    print(f"DATABASE_REPLICA_URLS=sqlite:///{replica}")
+    if args.once:
+        return
+
+    print(f"Replicating every {args.lag}s, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(args.lag)
+            replicate(primary, replica)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
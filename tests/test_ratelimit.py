@@ -0,0 +1,30 @@
+from starlette.requests import Request
+
+from app.config import settings
+from app.core.ratelimit import client_ip
+
+PROXY = "100.64.0.0/10"
+
+def make_request(peer: str, forwarded: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded is not None else []
+    return Request({"type": "http", "client": (peer, 40000), "headers": headers})
+
+def test_forged_leftmost_hop_is_ignored(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", PROXY)
+    # The client sent "X-Forwarded-For: 10.0.0.7"; the proxy appended the real address
+    request = make_request("100.64.3.4", "10.0.0.7, 203.0.113.9")
+    assert client_ip(request) == "203.0.113.9"
+
+def test_trusted_hops_are_skipped(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", PROXY)
+    request = make_request("100.64.3.4", "10.0.0.7, 203.0.113.9, 100.64.0.2")
+    assert client_ip(request) == "203.0.113.9"
+
+def test_header_from_untrusted_peer_is_ignored(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", PROXY)
+    request = make_request("198.51.100.1", "10.0.0.7")
+    assert client_ip(request) == "198.51.100.1"
+
+def test_no_trusted_proxies_disables_per_ip_keys(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", "")
+    assert client_ip(make_request("100.64.3.4", "10.0.0.7")) is None